@@ -2,19 +2,36 @@ import os
 import ast
 import pandas as pd
 
+from .spans import RaggedSpans
+
+
+DEFAULT_FOLDER = 'nbme-score-clinical-patient-notes'
+
 
 
 class DataLoader():
     """Manage all data loading and cleaning.
 
+    Parameters
+    ----------
+    folder : str, default='nbme-score-clinical-patient-notes'
+        Folder containing the competition CSV files.
+
+    apply_corrections : bool, default=True
+        Whether to apply the hand-written corrections of the Kaggle data. They
+        target fixed row indices, so they must be disabled for any other data
+        (e.g. the one written by `datasets.synthetic.SyntheticGenerator`).
+
     References
     ----------
     `From Kaggle Notebook <https://www.kaggle.com/yasufuminakama/
     nbme-deberta-base-baseline-train?scriptVersionId=87264998&cellId=17>`
     """
 
-    def __init__(self, *args, **kwargs):
-        self.folder = 'nbme-score-clinical-patient-notes'
+    def __init__(self, folder=DEFAULT_FOLDER, apply_corrections=True,
+                 *args, **kwargs):
+        self.folder = folder
+        self.apply_corrections = apply_corrections
         self.features_path = os.path.join(self.folder, 'features.csv')
         self.patient_notes_path = os.path.join(self.folder, 'patient_notes.csv')
 
@@ -23,10 +40,10 @@ class DataLoader():
         """Load all datasets.
         """
         self._load_features()
-        self._apply_correction_on_features()
         self._load_patient_notes()
         self._load_data()
-        self._apply_correction_on_data()
+        if self.apply_corrections:
+            self._apply_correction_on_data()
 
 
     def merge(self):
@@ -50,7 +67,8 @@ class DataLoader():
         """Load features file.
         """
         self.features = pd.read_csv(self.features_path)
-        self._apply_correction_on_features()
+        if self.apply_corrections:
+            self._apply_correction_on_features()
         self.features_to_index = {
             v: k for k, v in self.features['feature_text'].to_dict().items()
         }
@@ -92,6 +110,28 @@ class TrainLoader(DataLoader):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.data_path = os.path.join(self.folder, 'train.csv')
+        self._spans = (None, None)
+
+
+    @property
+    def spans(self):
+        """Ground truth spans of `data`, as a `RaggedSpans`.
+
+        Locations are parsed once and cached until `data` is replaced (by
+        `load`, `merge` or a user selection such as `data.iloc[:500]`). In-place
+        edits of `data` are not detected, call `invalidate_spans` after them.
+        """
+        data, spans = self._spans
+        if data is not self.data:
+            spans = RaggedSpans.from_locations(self.data['location'])
+            self._spans = (self.data, spans)
+        return spans
+
+
+    def invalidate_spans(self):
+        """Drop cached spans, so they are parsed again on next access.
+        """
+        self._spans = (None, None)
 
 
     def merge(self):
@@ -366,6 +406,8 @@ class TrainLoader(DataLoader):
         self.data.loc[14083, 'location'] = ast.literal_eval(
             '[["56 64;156 179"]]')
 
+        self.invalidate_spans()
+
 
 
 class TestLoader(DataLoader):
@@ -0,0 +1,206 @@
+"""
+Compact ragged storage of character-level spans.
+"""
+
+# System imports.
+import operator
+
+# Data management imports.
+import numpy as np
+
+
+
+class RaggedSpans():
+    """Character spans of all rows stored in flat int32 arrays.
+
+    Spans of row `i` are `bounds[row_offsets[i]:row_offsets[i+1]]`, each span
+    being a `[start, end]` pair. Discontinuous locations (`"0 1;3 4"`) give one
+    span per piece.
+
+    Parameters
+    ----------
+    row_offsets : ndarray of shape (n_rows + 1,)
+        Index of the first span of each row, the last value is the number of
+        spans.
+
+    bounds : ndarray of shape (n_spans, 2)
+        Start and end of every span.
+
+    Notes
+    -----
+    `starts`, `ends` and the rows returned by indexing are read-only views on
+    `bounds`, no copy is made. Rows can then be given directly to
+    `modeling.scoring.span_micro_f1`::
+
+        span_micro_f1(preds, dl.spans)
+    """
+
+    def __init__(self, row_offsets, bounds):
+        self.row_offsets = np.asarray(row_offsets, dtype=np.int32)
+        self.bounds = np.asarray(bounds, dtype=np.int32).reshape(-1, 2)
+        self.bounds.setflags(write=False)
+        self.starts = self.bounds[:, 0]
+        self.ends = self.bounds[:, 1]
+
+
+    @classmethod
+    def from_locations(cls, locations):
+        """Parse all locations at once.
+
+        Parameters
+        ----------
+        locations : iterable of lists of str
+            Locations of each row, such as `['0 1', '3 4;6 8']`. Nested lists
+            (e.g. `[['0 1']]`) are not accepted.
+
+        Returns
+        -------
+        RaggedSpans
+
+        Raises
+        ------
+        ValueError
+            If a row is not a list of str or a location is not made of
+            `"start end"` pairs.
+        """
+        joined = []
+        for row, location in enumerate(locations):
+            try:
+                joined.append(';'.join(location))
+            except TypeError:
+                raise ValueError(
+                    f'row {row}: location must be a list of str, '
+                    f'got {location!r}'
+                ) from None
+        counts = np.fromiter(
+            (s.count(';') + 1 if s else 0 for s in joined),
+            dtype=np.int32, count=len(joined)
+        )
+        row_offsets = np.zeros(len(joined) + 1, dtype=np.int32)
+        np.cumsum(counts, out=row_offsets[1:])
+        values = ' '.join(s for s in joined if s).replace(';', ' ').split()
+        if len(values) != 2 * row_offsets[-1]:
+            for row, (s, count) in enumerate(zip(joined, counts)):
+                if len(s.replace(';', ' ').split()) != 2 * count:
+                    raise ValueError(
+                        f'row {row}: malformed location {s!r}, expected '
+                        f'"start end" pairs joined by ";"'
+                    )
+        bounds = np.array(values, dtype=np.int64).astype(np.int32)
+        return cls(row_offsets, bounds)
+
+
+    def __len__(self):
+        return len(self.row_offsets) - 1
+
+
+    def __getitem__(self, idx):
+        """Spans of one row, as a view of shape (n_spans, 2), or a
+        `RaggedSpans` of the selected rows if `idx` is a slice.
+        """
+        if isinstance(idx, slice):
+            return self.take(range(len(self))[idx])
+        idx = operator.index(idx)
+        if not -len(self) <= idx < len(self):
+            raise IndexError(
+                f'row index {idx} out of range for {len(self)} rows'
+            )
+        if idx < 0:
+            idx += len(self)
+        return self.bounds[self.row_offsets[idx]:self.row_offsets[idx+1]]
+
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self.bounds[self.row_offsets[idx]:self.row_offsets[idx+1]]
+
+
+    def take(self, indices):
+        """Select some rows, such as a validation split.
+
+        Parameters
+        ----------
+        indices : array-like of ints
+            Rows to keep, negative values count from the end. Boolean masks
+            are rejected.
+
+        Returns
+        -------
+        RaggedSpans
+        """
+        indices = np.asarray(indices)
+        if indices.size == 0:
+            indices = indices.astype(np.intp)
+        if not np.issubdtype(indices.dtype, np.integer):
+            raise TypeError(
+                f'row indices must be integers, not {indices.dtype}'
+            )
+        out = (indices < -len(self)) | (indices >= len(self))
+        if out.any():
+            raise IndexError(
+                f'row index {indices[out][0]} out of range for {len(self)} rows'
+            )
+        indices = np.where(indices < 0, indices + len(self), indices)
+        lengths = np.diff(self.row_offsets)[indices]
+        row_offsets = np.zeros(len(indices) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=row_offsets[1:])
+        # Index of every kept span in `bounds`
+        spans_idx = (
+            np.repeat(self.row_offsets[indices] - row_offsets[:-1], lengths)
+            + np.arange(row_offsets[-1])
+        )
+        return RaggedSpans(row_offsets, self.bounds[spans_idx])
+
+
+
+if __name__ == "__main__":
+
+    # Regression checks: `python -m datasets.spans`
+    locations = [['1 2'], ['3 4'], ['7 8;9 10', '11 12'], [], ['13 14']]
+    rows = [[[1, 2]], [[3, 4]], [[7, 8], [9, 10], [11, 12]], [], [[13, 14]]]
+    spans = RaggedSpans.from_locations(locations)
+    assert spans.row_offsets.tolist() == [0, 1, 2, 5, 5, 6]
+    assert [row.tolist() for row in spans] == rows
+
+    # Indexing, including negative indices and slices
+    for idx in range(-len(rows), len(rows)):
+        assert spans[idx].tolist() == rows[idx]
+        assert spans.take([idx])[0].tolist() == rows[idx]
+    assert [row.tolist() for row in spans[1:4]] == rows[1:4]
+    assert [row.tolist() for row in spans[::-2]] == rows[::-2]
+    assert [row.tolist() for row in spans.take([4, -5, 2, 2])] == \
+        [rows[4], rows[0], rows[2], rows[2]]
+    assert len(spans.take([])) == 0
+
+    # Rows are read-only views
+    assert not spans[2].flags.writeable
+
+    # Invalid inputs must raise instead of returning wrong rows
+    for idx, error in [
+            (len(rows), IndexError), (-len(rows) - 1, IndexError),
+            (1.5, TypeError)]:
+        try:
+            spans[idx]
+        except error:
+            pass
+        else:
+            raise AssertionError(f'spans[{idx!r}] did not raise')
+    for indices, error in [
+            ([len(rows)], IndexError), ([-len(rows) - 1], IndexError),
+            ([False, True, True, False, False], TypeError),
+            ([0.5], TypeError)]:
+        try:
+            spans.take(indices)
+        except error:
+            pass
+        else:
+            raise AssertionError(f'take({indices!r}) did not raise')
+    for bad in ([['1 2;'], ['3 4']], [['1 2'], ['3']], [[['1 2']]]):
+        try:
+            RaggedSpans.from_locations(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'from_locations({bad!r}) did not raise')
+
+    print('All checks passed.')
@@ -0,0 +1,237 @@
+"""
+Synthetic data generator.
+
+Write deterministic, schema-identical copies of the competition CSV files so
+loaders and scoring functions can be run (and stress-tested) offline.
+"""
+
+# System imports.
+import os
+
+# Data management imports.
+import numpy as np
+import pandas as pd
+
+
+
+WORDS = [
+    'pain', 'chest', 'abdominal', 'headache', 'nausea', 'vomiting', 'fever',
+    'cough', 'fatigue', 'weight', 'loss', 'gain', 'sleep', 'stress', 'mother',
+    'father', 'history', 'family', 'denies', 'reports', 'started', 'days',
+    'weeks', 'months', 'ago', 'since', 'last', 'night', 'morning', 'worse',
+    'better', 'after', 'before', 'meals', 'exercise', 'smoking', 'alcohol',
+    'caffeine', 'palpitations', 'sweating', 'dizziness', 'shortness', 'breath',
+    'diarrhea', 'constipation', 'blood', 'stool', 'urine', 'period', 'cycle',
+    'heavy', 'irregular', 'medication', 'tylenol', 'ibuprofen', 'allergies',
+    'married', 'works', 'lives', 'alone', 'partner', 'sexually', 'active',
+    'no', 'with', 'and', 'the', 'of', 'for', 'in', 'her', 'his', 'is', 'has',
+]
+
+
+
+class SyntheticGenerator():
+    """Generate NBME-shaped data files.
+
+    Parameters
+    ----------
+    folder : str
+        Output folder, created if needed.
+
+    scale : float, default=1.
+        Volume relatively to the competition data. There are
+        `n_cases * round(100 * scale)` annotated notes, hence
+        `n_cases * n_features_per_case * round(100 * scale)` rows in
+        `train.csv`.
+
+    n_cases : int, default=10
+        Number of clinical cases.
+
+    n_features_per_case : int, default=14
+        Number of features per clinical case.
+
+    seed : int, default=0
+        Seed of the random generator, same seed gives identical files.
+
+    Notes
+    -----
+    Spans always match the text of `pn_history`. About a third of the rows
+    have no annotation and ~5% of the annotations are discontinuous, hence
+    written with `;`-joined locations as in the competition data.
+
+    The loaders must be used with `apply_corrections=False`::
+
+        SyntheticGenerator('synthetic', scale=10.).generate()
+        dl = TrainLoader(folder='synthetic', apply_corrections=False)
+    """
+
+    def __init__(self, folder, scale=1., n_cases=10, n_features_per_case=14,
+                 seed=0):
+        self.folder = folder
+        self.scale = scale
+        self.n_cases = n_cases
+        self.n_features_per_case = n_features_per_case
+        self.seed = seed
+
+        # Competition ratios
+        self.n_train_notes_per_case = max(1, int(round(100 * scale)))
+        self.n_extra_notes_per_case = int(round(4115 * scale))
+        self.n_test_rows = 5
+        self.p_empty = .37
+        self.p_discontinuous = .05
+
+
+    def generate(self):
+        """Generate and write all files.
+
+        Returns
+        -------
+        folder : str
+            Output folder.
+        """
+        self.rng = np.random.RandomState(self.seed)
+        os.makedirs(self.folder, exist_ok=True)
+
+        features = self._generate_features()
+        patient_notes, train = self._generate_notes(features)
+        test = train.loc[
+            self.rng.choice(len(train), self.n_test_rows, replace=False),
+            ['id', 'case_num', 'pn_num', 'feature_num']
+        ].sort_index()
+        submission = pd.DataFrame({'id': test['id'], 'location': ''})
+
+        features.to_csv(
+            os.path.join(self.folder, 'features.csv'), index=False
+        )
+        patient_notes.to_csv(
+            os.path.join(self.folder, 'patient_notes.csv'), index=False
+        )
+        train.to_csv(os.path.join(self.folder, 'train.csv'), index=False)
+        test.to_csv(os.path.join(self.folder, 'test.csv'), index=False)
+        submission.to_csv(
+            os.path.join(self.folder, 'sample_submission.csv'), index=False
+        )
+        return self.folder
+
+
+    def _words(self, low, high):
+        """Draw between `low` and `high` (excluded) random words.
+        """
+        n = self.rng.randint(low, high)
+        return ' '.join(WORDS[k] for k in self.rng.randint(len(WORDS), size=n))
+
+
+    def _generate_features(self):
+        """Generate features file.
+
+        Texts are redrawn on collision since `DataLoader.features_to_index` is
+        keyed on them.
+        """
+        rows, texts = [], set()
+        for case in range(self.n_cases):
+            for k in range(self.n_features_per_case):
+                text = self._words(1, 6).replace(' ', '-')
+                while text in texts:
+                    text = self._words(1, 6).replace(' ', '-')
+                texts.add(text)
+                rows.append((100 * case + k, case, text))
+        return pd.DataFrame(
+            rows, columns=['feature_num', 'case_num', 'feature_text']
+        )
+
+
+    def _generate_note(self, n_annotations):
+        """Generate one note with spans for each feature.
+
+        Parameters
+        ----------
+        n_annotations : ndarray
+            Number of annotations to insert for each feature.
+
+        Returns
+        -------
+        history : str
+            Text of the note.
+
+        annotations : list of lists of str
+            Annotations for each feature.
+
+        locations : list of lists of str
+            Locations for each feature, as `"start end[;start end]"`.
+        """
+        chunks, offset = [], 0
+        annotations = [[] for _ in n_annotations]
+        locations = [[] for _ in n_annotations]
+
+        def _append(text):
+            nonlocal offset
+            chunks.append(text)
+            start = offset
+            offset += len(text)
+            return start, offset
+
+        # Shuffle features so annotations are spread along the note
+        slots = np.repeat(np.arange(len(n_annotations)), n_annotations)
+        self.rng.shuffle(slots)
+        _append(self._words(3, 15).capitalize() + '. ')
+        for feature in slots:
+            _append(self._words(0, 6) + ' ')
+            first = self._words(1, 5)
+            start_1, end_1 = _append(first)
+            if self.rng.rand() < self.p_discontinuous:
+                _append(' ' + self._words(1, 4) + ' ')
+                second = self._words(1, 4)
+                start_2, end_2 = _append(second)
+                annotations[feature].append(first + ' ' + second)
+                locations[feature].append(
+                    f'{start_1} {end_1};{start_2} {end_2}'
+                )
+            else:
+                annotations[feature].append(first)
+                locations[feature].append(f'{start_1} {end_1}')
+            _append('. ')
+        _append(self._words(3, 15).capitalize() + '.')
+        return ''.join(chunks), annotations, locations
+
+
+    def _generate_notes(self, features):
+        """Generate patient notes and train files.
+        """
+        notes, train = [], []
+        pn_num = 0
+        for case in range(self.n_cases):
+            feature_nums = features.loc[
+                features['case_num'] == case, 'feature_num'
+            ].to_numpy()
+            for k in range(self.n_train_notes_per_case):
+                n_annotations = self.rng.choice(
+                    [0, 1, 2, 3], size=len(feature_nums),
+                    p=[self.p_empty, .53, .08, .02]
+                )
+                history, annotations, locations = self._generate_note(
+                    n_annotations
+                )
+                notes.append((pn_num, case, history))
+                for feature_num, annotation, location in zip(
+                        feature_nums, annotations, locations):
+                    train.append((
+                        f'{pn_num:05}_{feature_num:03}', case, pn_num,
+                        feature_num, str(annotation), str(location)
+                    ))
+                pn_num += 1
+            for k in range(self.n_extra_notes_per_case):
+                notes.append((pn_num, case, self._generate_note([])[0]))
+                pn_num += 1
+
+        patient_notes = pd.DataFrame(
+            notes, columns=['pn_num', 'case_num', 'pn_history']
+        )
+        train = pd.DataFrame(train, columns=[
+            'id', 'case_num', 'pn_num', 'feature_num', 'annotation', 'location'
+        ])
+        return patient_notes, train
+
+
+
+if __name__ == "__main__":
+
+    SyntheticGenerator('nbme-synthetic', scale=1.).generate()
@@ -39,7 +39,7 @@ def spans_to_binary(spans, length=None):
 
     Arguments
     ---------
-        spans : list of lists of two ints
+        spans : list of lists of two ints or ndarray of shape (n_spans, 2)
             Spans.
 
     Returns
@@ -61,8 +61,8 @@ def span_micro_f1(preds, truths):
     ---------
         preds : list of lists of two ints
             Prediction spans.
-        truths : list of lists of two ints
-            Ground truth spans.
+        truths : list of lists of two ints or datasets.spans.RaggedSpans
+            Ground truth spans, such as `TrainLoader.spans`.
 
     Returns
     -------